@@ -6,19 +6,107 @@ and evaluates agent performance against a set of test words.
 """
 
 import asyncio
-import json
-from typing import List, Dict, Any, Optional
+import sys
+import traceback
+from array import array
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Iterator, TextIO
 from dataclasses import dataclass, field
-from datetime import datetime
+
+try:
+    import uvloop  # Optional: faster libuv-based event loop
+except ImportError:
+    uvloop = None
 
 from game_agent_framework import (
     BaseGameAgent,
-    ParsedMessage,
     GameConfig,
+    json_dumps,
+    json_loads,
 )
 
 
-@dataclass
+# ==================== Feedback Scoring ====================
+
+# Feedback token for each base-3 digit of a packed feedback code
+FEEDBACK_TOKENS = ("absent", "present", "correct")
+
+
+@lru_cache(maxsize=None)
+def _feedback_code(guess: str, target: str) -> int:
+    """
+    Score a guess against a target and pack the result as a base-3 integer.
+
+    Digit i (weight 3**i) is 2 for correct, 1 for present and 0 for absent,
+    so identical feedback always maps to the same small integer.
+    """
+    # First pass: positional matches, computed in one zip over both words
+    matches = [g == t for g, t in zip(guess, target)]
+    digits = [2 if hit else 0 for hit in matches]
+    digits.extend([0] * (len(guess) - len(matches)))
+
+    # Count target letters not consumed by an exact match
+    remaining: Dict[str, int] = {}
+    for i, letter in enumerate(target):
+        if i >= len(matches) or not matches[i]:
+            remaining[letter] = remaining.get(letter, 0) + 1
+
+    # Second pass: mark present letters, consuming one target occurrence each
+    for i, letter in enumerate(guess):
+        if digits[i] == 2:
+            continue
+
+        if remaining.get(letter, 0) > 0:
+            digits[i] = 1
+            remaining[letter] -= 1
+
+    code = 0
+    for digit in reversed(digits):
+        code = code * 3 + digit
+    return code
+
+
+@lru_cache(maxsize=None)
+def _decode_feedback(code: int, length: int) -> Tuple[str, ...]:
+    """Unpack a base-3 feedback code into per-letter feedback tokens"""
+    tokens = []
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        tokens.append(FEEDBACK_TOKENS[digit])
+    return tuple(tokens)
+
+
+class FeedbackTable:
+    """
+    Precomputed packed feedback for every (guess, target) pair of a word list.
+
+    Build it once and share it across evaluations that reuse the same words;
+    scoring then becomes a single index into a flat array.
+    """
+
+    def __init__(self, words: List[str]):
+        # De-duplicate while keeping the given order, so ids are stable
+        self.words: List[str] = list(dict.fromkeys(w.lower() for w in words))
+        self.ids: Dict[str, int] = {w: i for i, w in enumerate(self.words)}
+        self.size = len(self.words)
+
+        # Smallest typecode that can hold a code for the longest word
+        max_code = 3 ** max((len(w) for w in self.words), default=0) - 1
+        typecode = next(t for t in ("B", "H", "L", "Q") if max_code < 1 << (8 * array(t).itemsize))
+
+        # Row-major (guess, target) layout in one flat array; the uncached
+        # scorer is used so the table does not also fill the lru_cache
+        score = _feedback_code.__wrapped__
+        self.table = array(typecode)
+        for g in self.words:
+            self.table.extend(score(g, t) for t in self.words)
+
+    def lookup(self, guess_id: int, target_id: int) -> int:
+        """Packed feedback code for a guess id against a target id"""
+        return self.table[guess_id * self.size + target_id]
+
+
+@dataclass(slots=True)
 class GameSession:
     """Represents a single game session"""
     target_word: str
@@ -30,11 +118,25 @@ class GameSession:
     feedback: List[List[str]] = field(default_factory=list)
     won: bool = False
     attempts_used: int = 0
+    feedback_code: Optional[int] = None  # Packed feedback of the latest guess
+    target_id: Optional[int] = None  # Target's id in the server's FeedbackTable, if any
+    all_correct_code: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        # Normalize once so scoring never has to lower-case the target again
+        self.target_word = self.target_word.lower()
+        # Packed code of a guess with every letter correct
+        self.all_correct_code = 3 ** len(self.target_word) - 1
     
     @property
     def word_length(self) -> int:
         return len(self.target_word)
 
+    def is_all_correct(self, code: int, guess_length: int) -> bool:
+        """Whether a packed feedback code marks every letter of the target correct"""
+        # Trailing absent letters pack to 0 digits, so the length has to match as well
+        return code == self.all_correct_code and guess_length == len(self.target_word)
+
 
 class MockGameServer:
     """
@@ -42,19 +144,34 @@ class MockGameServer:
     Handles game lifecycle and provides feedback for guesses.
     """
     
-    def __init__(self, test_words: List[str]):
+    def __init__(self, test_words: List[str], feedback_table: Optional[FeedbackTable] = None):
         self.test_words = test_words
+        self.feedback_table = feedback_table
         self.current_session: Optional[GameSession] = None
         self.session_counter = 0
+        self._cmd_template: Dict[str, Any] = {}
     
     def start_game(self, word: str) -> Dict[str, Any]:
         """Start a new game session"""
         self.session_counter += 1
         self.current_session = GameSession(
-            target_word=word.lower(),
+            target_word=word,
             match_id=f"mock-match-{self.session_counter}",
             game_id=f"mock-game-{self.session_counter}",
         )
+        if self.feedback_table is not None:
+            self.current_session.target_id = self.feedback_table.ids.get(self.current_session.target_word)
+
+        # Fields shared by every command message of this session
+        self._cmd_template = {
+            "type": "command",
+            "command": "guess",
+            "matchId": self.current_session.match_id,
+            "gameId": self.current_session.game_id,
+            "otp": self.current_session.otp,
+            "wordLength": self.current_session.word_length,
+            "maxAttempts": self.current_session.max_attempts,
+        }
         
         return {
             "type": "game start",
@@ -75,33 +192,22 @@ class MockGameServer:
         if not self.current_session:
             return []
         
-        target = self.current_session.target_word.lower()
-        guess = guess.lower()
-        feedback = []
-        
-        # Track used letters in target
-        target_letters = list(target)
-        
-        # First pass: mark correct positions
-        for i, letter in enumerate(guess):
-            if i < len(target) and letter == target[i]:
-                feedback.append("correct")
-                target_letters[i] = None  # Mark as used
-            else:
-                feedback.append("unknown")  # Placeholder
-        
-        # Second pass: mark present letters
-        for i, letter in enumerate(guess):
-            if feedback[i] == "correct":
-                continue
-            
-            if letter in target_letters:
-                feedback[i] = "present"
-                target_letters[target_letters.index(letter)] = None  # Mark as used
-            else:
-                feedback[i] = "absent"
-        
-        return feedback
+        return list(_decode_feedback(self.feedback_code(guess), len(guess)))
+
+    def feedback_code(self, guess: str) -> int:
+        """Packed base-3 feedback for a guess against the current target (see _feedback_code)"""
+        return self._score(guess.lower())
+
+    def _score(self, guess: str) -> int:
+        """Packed feedback for a lower-cased guess, from the table when both words are in it"""
+        session = self.current_session
+        table = self.feedback_table
+        if table is not None and session.target_id is not None:
+            guess_id = table.ids.get(guess)
+            if guess_id is not None:
+                return table.lookup(guess_id, session.target_id)
+
+        return _feedback_code(guess, session.target_word)
     
     def process_guess(self, guess: str) -> Dict[str, Any]:
         """
@@ -110,32 +216,39 @@ class MockGameServer:
         Returns:
             Command message with feedback for the guess
         """
-        if not self.current_session:
+        session = self.current_session
+        if not session:
             raise ValueError("No active game session")
         
         guess = guess.lower()
-        feedback = self.calculate_feedback(guess)
+        code = self._score(guess)
+        feedback = list(_decode_feedback(code, len(guess)))
         
-        self.current_session.guesses.append(guess)
-        self.current_session.feedback.append(feedback)
-        self.current_session.attempts_used += 1
+        session.guesses.append(guess)
+        session.feedback.append(feedback)
+        session.feedback_code = code
+        session.attempts_used += 1
         
         # Check if won
-        if all(f == "correct" for f in feedback):
-            self.current_session.won = True
+        if session.is_all_correct(code, len(guess)):
+            session.won = True
         
-        return {
-            "type": "command",
-            "command": "guess",
-            "matchId": self.current_session.match_id,
-            "gameId": self.current_session.game_id,
-            "otp": self.current_session.otp,
-            "wordLength": self.current_session.word_length,
-            "maxAttempts": self.current_session.max_attempts,
-            "currentAttempt": self.current_session.attempts_used + 1,
-            "lastGuess": guess,
-            "lastResult": feedback,
-        }
+        return self._command_message(session.attempts_used + 1, guess, feedback)
+
+    def first_command(self) -> Dict[str, Any]:
+        """Return the command message asking for the first guess"""
+        if not self.current_session:
+            raise ValueError("No active game session")
+
+        return self._command_message(1, "", [])
+
+    def _command_message(self, current_attempt: int, last_guess: str, last_result: List[str]) -> Dict[str, Any]:
+        """Build a command message from the session template and the per-turn fields"""
+        msg = self._cmd_template.copy()
+        msg["currentAttempt"] = current_attempt
+        msg["lastGuess"] = last_guess
+        msg["lastResult"] = last_result
+        return msg
     
     def end_game(self) -> Dict[str, Any]:
         """End the current game and return result"""
@@ -153,7 +266,7 @@ class MockGameServer:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationResult:
     """Results from evaluating an agent on a word"""
     word: str
@@ -161,6 +274,49 @@ class EvaluationResult:
     attempts: int
     guesses: List[str]
     success: bool  # Whether agent completed without errors
+    log: List[str] = field(default_factory=list, repr=False)  # Buffered progress output
+
+
+def _result_record(result: EvaluationResult) -> Dict[str, Any]:
+    """JSON-serializable form of a result (the buffered log is left out)"""
+    return {
+        "word": result.word,
+        "won": result.won,
+        "attempts": result.attempts,
+        "guesses": result.guesses,
+        "success": result.success,
+    }
+
+
+@dataclass(slots=True)
+class EvaluationStats:
+    """Running totals over evaluation results, updated one result at a time"""
+    total: int = 0
+    wins: int = 0
+    win_attempts: int = 0  # Sum of attempts over won games
+    errors: int = 0  # Evaluations that did not complete cleanly
+
+    def add(self, result: EvaluationResult):
+        """Fold one result into the totals"""
+        self.total += 1
+        if result.won:
+            self.wins += 1
+            self.win_attempts += result.attempts
+        if not result.success:
+            self.errors += 1
+
+    @property
+    def losses(self) -> int:
+        return self.total - self.wins
+
+    @property
+    def win_rate(self) -> float:
+        return (self.wins / self.total * 100) if self.total > 0 else 0
+
+    @property
+    def avg_attempts(self) -> float:
+        """Average attempts over won games only"""
+        return self.win_attempts / self.wins if self.wins > 0 else 0
 
 
 class AgentEvaluator:
@@ -168,115 +324,126 @@ class AgentEvaluator:
     Evaluates agent performance against test words using a mock server.
     """
     
-    def __init__(self, agent_factory: callable, test_words: List[str]):
+    def __init__(
+        self,
+        agent_factory: Optional[callable],
+        test_words: List[str],
+        max_concurrency: int = 8,
+        agent: Optional[BaseGameAgent] = None,
+        output_path: Optional[str] = None,
+        feedback_table: Optional[FeedbackTable] = None,
+    ):
         """
         Args:
             agent_factory: Callable that returns a new agent instance
             test_words: List of words to test
+            max_concurrency: Maximum number of words evaluated at the same time
+            agent: Optional agent reused for every word (reset() between words)
+                instead of building a new one from agent_factory
+            output_path: Optional JSONL file that results are streamed to as they
+                finish; when set, results are not kept in memory
+            feedback_table: Optional precomputed FeedbackTable shared by every
+                game; guesses outside it are scored directly
         """
+        if agent_factory is None and agent is None:
+            raise ValueError("Either agent_factory or agent is required")
+
         self.agent_factory = agent_factory
         self.test_words = test_words
+        self.max_concurrency = max_concurrency
+        self.agent = agent
+        self.output_path = output_path
+        self.feedback_table = feedback_table
         self.results: List[EvaluationResult] = []
+        self.stats = EvaluationStats()
+        self._output: Optional[TextIO] = None
     
     async def evaluate_word(self, word: str) -> EvaluationResult:
         """Evaluate agent performance on a single word"""
-        print(f"\n{'='*60}")
-        print(f"🎯 Testing word: {word.upper()}")
-        print(f"{'='*60}")
-        
-        # Create fresh agent and mock server for this word
-        agent = self.agent_factory()
-        mock_server = MockGameServer([word])
+        # Output is buffered on the result and written in one go so concurrent words don't interleave
+        log: List[str] = []
+        log.append(f"\n{'='*60}")
+        log.append(f"🎯 Testing word: {word.upper()}")
+        log.append(f"{'='*60}")
+        
+        # Reuse the shared agent if one was given, otherwise create a fresh one; its
+        # log lines go into this word's buffer too (a shared agent plays one word at a time)
+        if self.agent is not None:
+            agent = self.agent
+            agent.log_sink = log.append
+            agent.reset()
+        else:
+            agent = self.agent_factory()
+            agent.log_sink = log.append
+        mock_server = MockGameServer([word], feedback_table=self.feedback_table)
         
         # Start game
         game_start_msg = mock_server.start_game(word)
-        parsed_start = agent.parse_message(json.dumps(game_start_msg))
-        
-        if not parsed_start:
-            print("❌ Failed to parse game start message")
-            return EvaluationResult(word, False, 0, [], False)
-        
+        parsed_start = agent.parse_message_dict(game_start_msg)
         agent.handle_game_start(parsed_start)
         
         # Game loop
         guesses = []
         success = True
         
+        session = mock_server.current_session
+        
         try:
-            while mock_server.current_session.attempts_used < mock_server.current_session.max_attempts:
-                # Get first guess (simulate command message)
-                if not guesses:
-                    # First guess - send initial command
-                    command_msg = {
-                        "type": "command",
-                        "command": "guess",
-                        "matchId": mock_server.current_session.match_id,
-                        "gameId": mock_server.current_session.game_id,
-                        "otp": mock_server.current_session.otp,
-                        "wordLength": mock_server.current_session.word_length,
-                        "maxAttempts": mock_server.current_session.max_attempts,
-                        "currentAttempt": 1,
-                        "lastGuess": "",
-                        "lastResult": [],
-                    }
-                    parsed = agent.parse_message(json.dumps(command_msg))
-                else:
-                    # Send feedback from last guess
-                    command_msg = mock_server.process_guess(guesses[-1])
-                    parsed = agent.parse_message(json.dumps(command_msg))
-                
-                if not parsed:
-                    print("❌ Failed to parse message")
-                    success = False
-                    break
+            # First guess - send initial command
+            command_msg = mock_server.first_command()
+            
+            while session.attempts_used < session.max_attempts:
+                parsed = agent.parse_message_dict(command_msg)
                 
                 # Get agent's guess
                 guess = await agent.make_move(parsed)
                 
                 if not guess:
-                    print("❌ Agent failed to make a guess")
+                    log.append("❌ Agent failed to make a guess")
                     success = False
                     break
                 
                 guesses.append(guess)
-                print(f"📝 Guess {len(guesses)}: {guess}")
+                log.append(f"📝 Guess {len(guesses)}: {guess}")
                 
-                # Check if correct
-                feedback = mock_server.calculate_feedback(guess)
-                print(f"   Feedback: {' '.join(feedback)}")
+                # Score the guess once; the next command carries its feedback
+                command_msg = mock_server.process_guess(guess)
+                log.append(f"   Feedback: {' '.join(session.feedback[-1])}")
                 
-                if all(f == "correct" for f in feedback):
-                    mock_server.current_session.won = True
-                    mock_server.current_session.attempts_used = len(guesses)
+                if session.won:
                     break
         
         except Exception as e:
-            print(f"❌ Error during evaluation: {e}")
-            import traceback
-            traceback.print_exc()
+            log.append(f"❌ Error during evaluation: {e}")
+            log.append(traceback.format_exc().rstrip())
             success = False
         
         # End game
         end_msg = mock_server.end_game()
-        parsed_end = agent.parse_message(json.dumps(end_msg))
-        if parsed_end:
-            agent.handle_game_result(parsed_end)
+        agent.handle_game_result(agent.parse_message_dict(end_msg))
+        agent.log_sink = None
         
         result = EvaluationResult(
             word=word,
-            won=mock_server.current_session.won,
+            won=session.won,
             attempts=len(guesses),
             guesses=guesses,
             success=success,
+            log=log,
         )
         
         # Print result
         if result.won:
-            print(f"✅ WON in {result.attempts} attempts!")
+            log.append(f"✅ WON in {result.attempts} attempts!")
         else:
-            print(f"❌ LOST - Failed to guess '{word}' in {result.attempts} attempts")
-        
+            log.append(f"❌ LOST - Failed to guess '{word}' in {result.attempts} attempts")
+
+        self._write_log(result)
         return result
+
+    def _write_log(self, result: EvaluationResult):
+        """Write a word's buffered output to stdout with a single write"""
+        sys.stdout.write("\n".join(result.log) + "\n")
     
     async def run_evaluation(self) -> Dict[str, Any]:
         """Run evaluation on all test words"""
@@ -286,72 +453,119 @@ class AgentEvaluator:
         print(f"Test words: {', '.join(self.test_words)}")
         print()
         
-        for word in self.test_words:
-            result = await self.evaluate_word(word)
-            self.results.append(result)
+        # A shared agent can only play one game at a time
+        semaphore = asyncio.Semaphore(1 if self.agent is not None else self.max_concurrency)
+
+        self.results = []
+        self.stats = EvaluationStats()
+        # In-memory results are slotted by position so they keep input order
+        slots: List[Optional[EvaluationResult]] = []
+
+        async def run_word(index: int, word: str):
+            async with semaphore:
+                result = await self.evaluate_word(word)
+            self._record(result)
+            if self._output is None:
+                slots[index] = result
+
+        # Words are independent, so evaluate them concurrently
+        if self.output_path:
+            with open(self.output_path, "w", encoding="utf-8") as output:
+                self._output = output
+                try:
+                    await asyncio.gather(*(run_word(i, word) for i, word in enumerate(self.test_words)))
+                finally:
+                    self._output = None
+        else:
+            slots = [None] * len(self.test_words)
+            await asyncio.gather(*(run_word(i, word) for i, word in enumerate(self.test_words)))
+            self.results = slots
         
         # Print summary
         self.print_summary()
         
         return self.get_summary_stats()
     
+    def _record(self, result: EvaluationResult):
+        """Add a finished result to the running stats and stream it if an output file is open"""
+        self.stats.add(result)
+        if self._output is not None:
+            self._output.write(json_dumps(_result_record(result)) + "\n")
+
+    def iter_results(self) -> Iterator[Dict[str, Any]]:
+        """Yield per-word result records, re-reading the output file when streaming"""
+        if not self.output_path:
+            for result in self.results:
+                yield _result_record(result)
+            return
+
+        with open(self.output_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json_loads(line)
+
     def print_summary(self):
         """Print evaluation summary"""
         print("\n" + "="*60)
         print("📊 EVALUATION SUMMARY")
         print("="*60)
         
-        for result in self.results:
-            status = "✅ WIN" if result.won else "❌ LOSS"
-            print(f"\n{result.word.upper()}: {status}")
-            print(f"  Attempts: {result.attempts}/{6}")
-            print(f"  Guesses: {', '.join(result.guesses)}")
-            if not result.success:
+        for result in self.iter_results():
+            status = "✅ WIN" if result["won"] else "❌ LOSS"
+            print(f"\n{result['word'].upper()}: {status}")
+            print(f"  Attempts: {result['attempts']}/{6}")
+            print(f"  Guesses: {', '.join(result['guesses'])}")
+            if not result["success"]:
                 print(f"  ⚠️ Evaluation had errors")
         
         # Overall stats
-        wins = sum(1 for r in self.results if r.won)
-        total = len(self.results)
-        win_rate = (wins / total * 100) if total > 0 else 0
-        avg_attempts = sum(r.attempts for r in self.results if r.won) / wins if wins > 0 else 0
+        stats = self.stats
         
         print("\n" + "-"*60)
-        print(f"Total Games: {total}")
-        print(f"Wins: {wins}")
-        print(f"Losses: {total - wins}")
-        print(f"Win Rate: {win_rate:.1f}%")
-        if wins > 0:
-            print(f"Avg Attempts (wins only): {avg_attempts:.1f}")
+        print(f"Total Games: {stats.total}")
+        print(f"Wins: {stats.wins}")
+        print(f"Losses: {stats.losses}")
+        print(f"Win Rate: {stats.win_rate:.1f}%")
+        if stats.wins > 0:
+            print(f"Avg Attempts (wins only): {stats.avg_attempts:.1f}")
         print("="*60)
     
-    def get_summary_stats(self) -> Dict[str, Any]:
-        """Get summary statistics"""
-        wins = sum(1 for r in self.results if r.won)
-        total = len(self.results)
-        
-        return {
-            "total_games": total,
-            "wins": wins,
-            "losses": total - wins,
-            "win_rate": (wins / total * 100) if total > 0 else 0,
-            "avg_attempts": sum(r.attempts for r in self.results if r.won) / wins if wins > 0 else 0,
-            "results": [
+    def get_summary_stats(self, include_results: bool = True) -> Dict[str, Any]:
+        """
+        Get summary statistics
+
+        Args:
+            include_results: Include per-word results (read back from output_path
+                when streaming)
+        """
+        stats = self.stats
+        
+        summary = {
+            "total_games": stats.total,
+            "wins": stats.wins,
+            "losses": stats.losses,
+            "win_rate": stats.win_rate,
+            "avg_attempts": stats.avg_attempts,
+            "errors": stats.errors,
+        }
+        if include_results:
+            summary["results"] = [
                 {
-                    "word": r.word,
-                    "won": r.won,
-                    "attempts": r.attempts,
-                    "guesses": r.guesses,
+                    "word": r["word"],
+                    "won": r["won"],
+                    "attempts": r["attempts"],
+                    "guesses": r["guesses"],
                 }
-                for r in self.results
+                for r in self.iter_results()
             ]
-        }
+        return summary
 
 
 # ==================== Example Usage ====================
 
 async def run_evaluation_example():
     """Example of running agent evaluation"""
-    from wordle_agent_example import WordleAgent
+    from wordle_agent_example import WordleAgent, at_most_two_vowels
     
     # Test words
     test_words = [
@@ -372,6 +586,7 @@ async def run_evaluation_example():
             config=config,
             ai_model="gpt-4o",
             use_ai=True,  # Set to False for faster testing without AI
+            candidate_filter=at_most_two_vowels,
         )
     
     # Run evaluation
@@ -384,4 +599,7 @@ async def run_evaluation_example():
 
 if __name__ == "__main__":
     print("🧪 Agent Evaluation Runner\n")
-    asyncio.run(run_evaluation_example())
+    asyncio.run(
+        run_evaluation_example(),
+        loop_factory=uvloop.new_event_loop if uvloop is not None else None,
+    )
@@ -9,16 +9,48 @@ This framework provides:
 """
 
 import asyncio
+import functools
 import json
-import os
+import sys
+import time
+import traceback
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime, UTC
-from enum import Enum
-from typing import Optional, Any, Dict, List
+from enum import Enum, IntEnum
+from typing import Optional, Any, Callable, Dict, List, Set, Union
 
 import websockets
 
+try:
+    import orjson  # Optional: faster JSON encode/decode for the message hot path
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop  # Optional: faster libuv-based event loop for run_agent
+except ImportError:
+    uvloop = None
+
+
+# ==================== JSON ====================
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the stdlib type
+if orjson is not None:
+    json_loads = orjson.loads
+    json_encode = orjson.dumps
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize to a JSON string (orjson emits UTF-8 bytes)"""
+        return orjson.dumps(obj).decode()
+else:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+    def json_encode(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes"""
+        return json.dumps(obj).encode()
+
 
 # ==================== Enums ====================
 
@@ -74,9 +106,70 @@ class FeedbackType(Enum):
     ABSENT = "absent"
 
 
+class LogLevel(IntEnum):
+    """Verbosity levels for agent and runner logs"""
+    DEBUG = 10  # Per-message chatter (acknowledgements, moves)
+    INFO = 20
+    WARNING = 30
+
+
+# Wire names (lower-case) for the enums above, used when parsing messages
+_MESSAGE_TYPES: Dict[str, MessageType] = {
+    "game start": MessageType.GAME_START,
+    "game result": MessageType.GAME_RESULT,
+    "command": MessageType.COMMAND,
+    "acknowledgement": MessageType.ACKNOWLEDGEMENT,
+    "error": MessageType.ERROR,
+}
+
+_COMMANDS: Dict[str, GameCommand] = {
+    "guess": GameCommand.GUESS,
+    "solve": GameCommand.SOLVE,
+    "hint": GameCommand.HINT,
+}
+
+_RESULTS: Dict[str, GameResult] = {
+    "win": GameResult.WIN,
+    "loss": GameResult.LOSS,
+    "timeout": GameResult.TIMEOUT,
+    "error": GameResult.ERROR,
+    "abandoned": GameResult.ABANDONED,
+}
+
+# Message types handled without a reply -> BaseGameAgent handler method name
+_TYPE_HANDLERS: Dict[MessageType, str] = {
+    MessageType.GAME_START: "handle_game_start",
+    MessageType.GAME_RESULT: "handle_game_result",
+    MessageType.ACKNOWLEDGEMENT: "handle_acknowledgement",
+    MessageType.ERROR: "handle_error",
+}
+
+# Commands that need a move in response
+_MOVE_COMMANDS = frozenset({GameCommand.GUESS, GameCommand.SOLVE})
+
+# Message keys already parsed into ParsedMessage fields; everything else goes to metadata
+_KNOWN_MESSAGE_KEYS = frozenset({
+    "type", "command", "result", "matchId", "gameId", "yourId", "otp",
+    "wordLength", "maxAttempts", "lastGuess", "lastResult", "currentAttempt", "word",
+})
+
+# Accepted feedback spellings (lower-case) -> standard FeedbackType value; anything else is absent
+_FEEDBACK_TOKENS: Dict[str, str] = {
+    "correct": FeedbackType.CORRECT.value,
+    "green": FeedbackType.CORRECT.value,
+    "g": FeedbackType.CORRECT.value,
+    "present": FeedbackType.PRESENT.value,
+    "yellow": FeedbackType.PRESENT.value,
+    "y": FeedbackType.PRESENT.value,
+    "absent": FeedbackType.ABSENT.value,
+}
+
+_CANONICAL_FEEDBACK = frozenset(feedback.value for feedback in FeedbackType)
+
+
 # ==================== Data Classes ====================
 
-@dataclass
+@dataclass(slots=True)
 class GameConfig:
     """Configuration for a game session"""
     ws_url: str
@@ -85,12 +178,14 @@ class GameConfig:
     keep_alive: bool = True
     max_reconnect_attempts: int = 3
     reconnect_delay: int = 5
+    stats_interval: int = 25  # Print stats after every Nth finished game (0 = only on request)
+    log_level: LogLevel = LogLevel.INFO  # Lowest level that is printed (DEBUG adds per-message logs)
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedMessage:
     """Standardized message structure from server"""
-    raw: str
+    raw: Union[str, bytes]  # Message as received; the WebSocket loops pass undecoded bytes
     type: MessageType
     command: Optional[GameCommand]
     match_id: Optional[str]
@@ -104,10 +199,10 @@ class ParsedMessage:
     current_attempt: Optional[int]
     result: Optional[GameResult]
     word: Optional[str]
-    metadata: Dict[str, Any]  # For game-specific data
+    metadata: Dict[str, Any]  # Game-specific fields (keys not mapped to the fields above)
 
 
-@dataclass
+@dataclass(slots=True)
 class GameStats:
     """Statistics for the current game session"""
     games_played: int = 0
@@ -117,6 +212,41 @@ class GameStats:
     current_game_guesses: int = 0
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
+    start_clock: Optional[float] = None  # time.monotonic() at game start, for the duration
+
+
+# ==================== Logging ====================
+
+# Last formatted second, shared by every agent and runner
+_ts_second = -1
+_ts_text = ""
+
+
+def log_timestamp() -> str:
+    """HH:MM:SS UTC for log lines, formatted at most once per second"""
+    global _ts_second, _ts_text
+    second = int(time.time())
+    if second != _ts_second:
+        _ts_text = time.strftime("%H:%M:%S", time.gmtime(second))
+        _ts_second = second
+    return _ts_text
+
+
+# ==================== Connection ====================
+
+def _connect(config: GameConfig):
+    """
+    Open the game WebSocket (use as an async context manager).
+    Game messages are small JSON objects, so per-message deflate is switched off;
+    asyncio already disables Nagle (TCP_NODELAY) on the underlying socket.
+    """
+    return websockets.connect(
+        config.ws_url,
+        open_timeout=config.connect_timeout,
+        compression=None,
+        max_size=2 ** 20,
+        max_queue=64,
+    )
 
 
 # ==================== Base Agent ====================
@@ -128,6 +258,9 @@ class BaseGameAgent(ABC):
     Subclasses implement game-specific logic.
     """
 
+    # Keep the whole decoded message in ParsedMessage.metadata instead of only unknown keys
+    KEEP_FULL_METADATA: bool = False
+
     def __init__(self, config: GameConfig, game_type: GameType, reusable: bool = False):
         self.config = config
         self.game_type = game_type
@@ -136,56 +269,84 @@ class BaseGameAgent(ABC):
         self.stats = GameStats()
         self._ws: Optional[websockets.WebSocketClientProtocol] = None
         self.current_game_id: Optional[str] = None
+        # Receives formatted log lines instead of stdout when set (e.g. to buffer one game's output)
+        self.log_sink: Optional[Callable[[str], None]] = None
 
     # ==================== Utility Methods ====================
 
     def ts(self) -> str:
         """Return a short UTC timestamp for log lines"""
-        return datetime.now(UTC).strftime("%H:%M:%S")
+        return log_timestamp()
 
-    def log(self, message: str, emoji: str = "ℹ️"):
+    def log(self, message: str, emoji: str = "ℹ️", level: LogLevel = LogLevel.INFO):
         """Consistent logging format"""
-        print(f"[{self.ts()}] {emoji} {message}")
+        if level < self.config.log_level:
+            return
+        line = f"[{self.ts()}] {emoji} {message}"
+        if self.log_sink is not None:
+            self.log_sink(line)
+        else:
+            print(line)
+
+    def _should_log(self, level: LogLevel) -> bool:
+        """Check the level first so hot paths can skip building messages that won't be printed"""
+        return level >= self.config.log_level
 
     # ==================== Message Parsing ====================
 
-    def parse_message(self, msg: str) -> Optional[ParsedMessage]:
+    def parse_message(self, msg: Union[str, bytes]) -> Optional[ParsedMessage]:
         """Parse incoming JSON message into ParsedMessage"""
+        # Empty keep-alive frames are dropped without running the parser
+        if not msg:
+            return None
         try:
-            obj = json.loads(msg)
+            obj = json_loads(msg)
         except json.JSONDecodeError:
             return None
+        if not isinstance(obj, dict):
+            return None
+
+        return self.parse_message_dict(obj, raw=msg)
+
+    def parse_message_dict(self, obj: Dict[str, Any], raw: Union[str, bytes] = "") -> ParsedMessage:
+        """
+        Build a ParsedMessage from an already-decoded message object.
+        In-process callers (e.g. the mock server) use this to skip the JSON round-trip.
+        """
+        get = obj.get  # Bound once for the dozen field lookups below
 
         # Determine message type
-        msg_type = self._parse_message_type(obj.get("type"))
+        msg_type = self._parse_message_type(get("type"))
         
         # Determine command type
-        command = self._parse_command(obj.get("command"))
+        command = self._parse_command(get("command"))
         
         # Determine result type
-        result = self._parse_result(obj.get("result"))
+        result = self._parse_result(get("result"))
 
         # Parse feedback/result list
-        last_guess = obj.get("lastGuess", "")
-        raw_result = obj.get("lastResult", [])
+        last_guess = get("lastGuess", "")
+        raw_result = get("lastResult", [])
         normalized_result = self._normalize_feedback(raw_result) if isinstance(raw_result, list) else []
 
         return ParsedMessage(
-            raw=msg,
+            raw=raw,
             type=msg_type,
             command=command,
-            match_id=obj.get("matchId"),
-            game_id=obj.get("gameId"),
-            your_id=obj.get("yourId"),
-            otp=obj.get("otp"),
-            word_length=obj.get("wordLength"),
-            max_attempts=obj.get("maxAttempts"),
+            match_id=get("matchId"),
+            game_id=get("gameId"),
+            your_id=get("yourId"),
+            otp=get("otp"),
+            word_length=get("wordLength"),
+            max_attempts=get("maxAttempts"),
             last_guess=last_guess,
             last_result=normalized_result,
-            current_attempt=obj.get("currentAttempt"),
+            current_attempt=get("currentAttempt"),
             result=result,
-            word=obj.get("word"),
-            metadata=obj  # Store full object for game-specific needs
+            word=get("word"),
+            metadata=obj if self.KEEP_FULL_METADATA else {
+                key: value for key, value in obj.items() if key not in _KNOWN_MESSAGE_KEYS
+            },
         )
 
     def _parse_message_type(self, type_str: Optional[str]) -> MessageType:
@@ -193,52 +354,45 @@ class BaseGameAgent(ABC):
         if not type_str:
             return MessageType.UNKNOWN
         
-        type_map = {
-            "game start": MessageType.GAME_START,
-            "game result": MessageType.GAME_RESULT,
-            "command": MessageType.COMMAND,
-            "acknowledgement": MessageType.ACKNOWLEDGEMENT,
-            "error": MessageType.ERROR,
-        }
-        return type_map.get(type_str.lower(), MessageType.UNKNOWN)
+        # Servers normally send canonical lower-case names, so try those before lower()
+        msg_type = _MESSAGE_TYPES.get(type_str)
+        if msg_type is None:
+            msg_type = _MESSAGE_TYPES.get(type_str.lower(), MessageType.UNKNOWN)
+        return msg_type
 
     def _parse_command(self, command_str: Optional[str]) -> Optional[GameCommand]:
         """Parse command type from string"""
         if not command_str:
             return None
         
-        command_map = {
-            "guess": GameCommand.GUESS,
-            "solve": GameCommand.SOLVE,
-            "hint": GameCommand.HINT,
-        }
-        return command_map.get(command_str.lower(), GameCommand.UNKNOWN)
+        command = _COMMANDS.get(command_str)
+        if command is None:
+            command = _COMMANDS.get(command_str.lower(), GameCommand.UNKNOWN)
+        return command
 
     def _parse_result(self, result_str: Optional[str]) -> Optional[GameResult]:
         """Parse game result from string"""
         if not result_str:
             return None
         
-        result_map = {
-            "win": GameResult.WIN,
-            "loss": GameResult.LOSS,
-            "timeout": GameResult.TIMEOUT,
-            "error": GameResult.ERROR,
-            "abandoned": GameResult.ABANDONED,
-        }
-        return result_map.get(result_str.lower(), GameResult.UNKNOWN)
+        result = _RESULTS.get(result_str)
+        if result is None:
+            result = _RESULTS.get(result_str.lower(), GameResult.UNKNOWN)
+        return result
 
     def _normalize_feedback(self, feedback: List[str]) -> List[str]:
         """Normalize feedback tokens to standard format"""
+        # Servers normally send the standard tokens already; reuse the list as-is then
+        if all(isinstance(token, str) and token in _CANONICAL_FEEDBACK for token in feedback):
+            return feedback
+
         normalized = []
         for token in feedback:
-            cleaned = str(token).strip().lower()
-            if cleaned in {"correct", "green", "g"}:
-                normalized.append(FeedbackType.CORRECT.value)
-            elif cleaned in {"present", "yellow", "y"}:
-                normalized.append(FeedbackType.PRESENT.value)
-            else:
-                normalized.append(FeedbackType.ABSENT.value)
+            value = _FEEDBACK_TOKENS.get(token) if isinstance(token, str) else None
+            if value is None:
+                # Unusual spelling, casing or padding: clean it up and look again
+                value = _FEEDBACK_TOKENS.get(str(token).strip().lower(), FeedbackType.ABSENT.value)
+            normalized.append(value)
         return normalized
 
     # ==================== Game Lifecycle Handlers ====================
@@ -250,6 +404,7 @@ class BaseGameAgent(ABC):
         self.stats.games_played += 1
         self.stats.current_game_guesses = 0
         self.stats.start_time = datetime.now(UTC)
+        self.stats.start_clock = time.monotonic()
         
         self.log(f"🎮 Game started - ID: {parsed.game_id}, Word Length: {parsed.word_length}, Max Attempts: {parsed.max_attempts}")
         self.on_game_start(parsed)
@@ -269,20 +424,32 @@ class BaseGameAgent(ABC):
             self.log(f"🎯 Game Result: {parsed.result.value if parsed.result else 'unknown'} | Word: {parsed.word}")
         
         # Calculate game duration
-        if self.stats.start_time and self.stats.end_time:
-            duration = (self.stats.end_time - self.stats.start_time).total_seconds()
+        if self.stats.start_clock is not None:
+            duration = time.monotonic() - self.stats.start_clock
             self.log(f"⏱️ Game duration: {duration:.2f}s")
         
         self.on_game_result(parsed)
-        self.print_stats()
+        interval = self.config.stats_interval
+        if interval and self.stats.games_played % interval == 0:
+            self.print_stats()
         
         # Reset current game ID if not reusable
         if not self.reusable:
             self.current_game_id = None
 
+    def reset(self):
+        """
+        Clear per-game state so the same agent can play a fresh game.
+        Long-lived resources (AI clients, loaded word lists) are kept;
+        subclasses should extend this to clear their own per-game state.
+        """
+        self.state = AgentState.IDLE
+        self.current_game_id = None
+        self.stats.current_game_guesses = 0
+
     def handle_acknowledgement(self, parsed: ParsedMessage):
         """Handle acknowledgement messages"""
-        self.log(f"✅ Acknowledgement received", "📨")
+        self.log(f"✅ Acknowledgement received", "📨", LogLevel.DEBUG)
         self.on_acknowledgement(parsed)
 
     def handle_error(self, parsed: ParsedMessage):
@@ -354,30 +521,20 @@ class BaseGameAgent(ABC):
         Main message router - delegates to appropriate handler.
         Returns response dict if a reply is needed.
         """
-        # Handle different message types
-        if parsed.type == MessageType.GAME_START:
-            self.handle_game_start(parsed)
-            return None
-
-        if parsed.type == MessageType.GAME_RESULT:
-            self.handle_game_result(parsed)
-            return None
-
-        if parsed.type == MessageType.ACKNOWLEDGEMENT:
-            self.handle_acknowledgement(parsed)
-            return None
-
-        if parsed.type == MessageType.ERROR:
-            self.handle_error(parsed)
+        # Handle different message types (looked up by name so subclass overrides apply)
+        handler = _TYPE_HANDLERS.get(parsed.type)
+        if handler is not None:
+            getattr(self, handler)(parsed)
             return None
 
         # Handle commands that need responses
-        if parsed.command in [GameCommand.GUESS, GameCommand.SOLVE]:
+        if parsed.command in _MOVE_COMMANDS:
             move = await self.make_move(parsed)
             if move:
                 self.stats.current_game_guesses += 1
                 self.stats.total_guesses += 1
-                self.log(f"🧠 Move #{self.stats.current_game_guesses}: {move}")
+                if self._should_log(LogLevel.DEBUG):
+                    self.log(f"🧠 Move #{self.stats.current_game_guesses}: {move}", level=LogLevel.DEBUG)
             
             response = self.build_response(parsed, move)
             return response
@@ -394,10 +551,7 @@ class BaseGameAgent(ABC):
                 self.state = AgentState.CONNECTING
                 self.log(f"🔌 Connecting to {self.config.ws_url} (attempt {attempt + 1}/{self.config.max_reconnect_attempts})")
                 
-                async with websockets.connect(
-                    self.config.ws_url,
-                    open_timeout=self.config.connect_timeout
-                ) as ws:
+                async with _connect(self.config) as ws:
                     self._ws = ws
                     self.state = AgentState.CONNECTED
                     self.log("✅ Connection established")
@@ -425,29 +579,40 @@ class BaseGameAgent(ABC):
     async def run_loop(self):
         """Main game loop - listen for messages and respond"""
         self.log(f"👂 Listening for messages (timeout={self.config.recv_timeout}s)")
+        if not self._ws:
+            return
+
+        # Bind per-iteration lookups once; none of them change while the socket is open
+        # decode=False hands text frames over as bytes; the JSON parser reads them without a str copy
+        recv = functools.partial(self._ws.recv, decode=False)
+        send = self._ws.send
+        recv_timeout = self.config.recv_timeout
+        keep_alive = self.config.keep_alive
+        parse_message = self.parse_message
+        handle_message = self.handle_message
         
-        while self._ws:
+        while True:
             try:
-                msg = await asyncio.wait_for(
-                    self._ws.recv(),
-                    timeout=self.config.recv_timeout
-                )
+                # asyncio.timeout arms a timer on the current task instead of wrapping recv() in a new one
+                async with asyncio.timeout(recv_timeout):
+                    msg = await recv()
                 
-                parsed = self.parse_message(msg)
+                parsed = parse_message(msg)
                 if parsed is None:
                     self.log("⚠️ Received non-JSON message; ignoring")
                     continue
 
-                response = await self.handle_message(parsed)
+                response = await handle_message(parsed)
                 
                 if response:
-                    await self._ws.send(json.dumps(response))
+                    # UTF-8 bytes sent as a TEXT frame, so websockets skips its own encode
+                    await send(json_encode(response), text=True)
                     # self.log(f"📤 Sent response")
 
             except asyncio.TimeoutError:
-                if self.config.keep_alive:
+                if keep_alive:
                     continue
-                self.log(f"⏹️ No messages within {self.config.recv_timeout}s; closing")
+                self.log(f"⏹️ No messages within {recv_timeout}s; closing")
                 break
                 
             except websockets.exceptions.ConnectionClosedOK:
@@ -465,18 +630,25 @@ class BaseGameAgent(ABC):
     # ==================== Statistics ====================
 
     def print_stats(self):
-        """Print current game statistics"""
+        """Print current game statistics (an INFO-level message)"""
+        if not self._should_log(LogLevel.INFO):
+            return
         win_rate = (self.stats.games_won / self.stats.games_played * 100) if self.stats.games_played > 0 else 0
         avg_guesses = (self.stats.total_guesses / self.stats.games_played) if self.stats.games_played > 0 else 0
         
-        self.log("=" * 50, "📊")
-        self.log(f"Games Played: {self.stats.games_played}", "📊")
-        self.log(f"Games Won: {self.stats.games_won}", "📊")
-        self.log(f"Games Lost: {self.stats.games_lost}", "📊")
-        self.log(f"Win Rate: {win_rate:.1f}%", "📊")
-        self.log(f"Total Guesses: {self.stats.total_guesses}", "📊")
-        self.log(f"Avg Guesses/Game: {avg_guesses:.1f}", "📊")
-        self.log("=" * 50, "📊")
+        lines = [
+            "=" * 50,
+            f"Games Played: {self.stats.games_played}",
+            f"Games Won: {self.stats.games_won}",
+            f"Games Lost: {self.stats.games_lost}",
+            f"Win Rate: {win_rate:.1f}%",
+            f"Total Guesses: {self.stats.total_guesses}",
+            f"Avg Guesses/Game: {avg_guesses:.1f}",
+            "=" * 50,
+        ]
+        # One write for the whole block
+        prefix = f"[{self.ts()}] 📊 "
+        sys.stdout.write("".join(f"{prefix}{line}\n" for line in lines))
 
 
 # ==================== Agent Runner ====================
@@ -488,24 +660,29 @@ class AgentRunner:
     When reusable=False, creates a new agent instance for each game ID.
     """
 
-    def __init__(self, agent_factory: callable, reusable: bool = False):
+    def __init__(self, agent_factory: callable, reusable: bool = False, config: Optional[GameConfig] = None):
         """
         Args:
             agent_factory: A callable that returns a new BaseGameAgent instance
             reusable: If False, create new agent for each game ID. If True, reuse agents.
+            config: Connection config; if omitted it is read from the first agent built
         """
         self.agent_factory = agent_factory
         self.reusable = reusable
+        self.config = config
+        self._spare_agent: Optional[BaseGameAgent] = None  # Built early for its config, used for the first game
         self.agents: Dict[str, BaseGameAgent] = {}  # game_id -> agent
         self.primary_agent: Optional[BaseGameAgent] = None
         self._ws: Optional[websockets.WebSocketClientProtocol] = None
 
     def ts(self) -> str:
         """Return a short UTC timestamp for log lines"""
-        return datetime.now(UTC).strftime("%H:%M:%S")
+        return log_timestamp()
 
-    def log(self, message: str, emoji: str = "ℹ️"):
+    def log(self, message: str, emoji: str = "ℹ️", level: LogLevel = LogLevel.INFO):
         """Consistent logging format"""
+        if self.config is not None and level < self.config.log_level:
+            return
         print(f"[{self.ts()}] {emoji} {message}")
 
     def get_or_create_agent(self, game_id: Optional[str]) -> BaseGameAgent:
@@ -521,33 +698,43 @@ class AgentRunner:
         # If reusable or no game_id, use/create primary agent
         if self.reusable or game_id is None:
             if self.primary_agent is None:
-                self.primary_agent = self.agent_factory()
-                self.primary_agent._ws = self._ws
+                self.primary_agent = self._new_agent()
                 self.log(f"🤖 Created primary agent (reusable={self.reusable})")
             return self.primary_agent
         
         # Create new agent per game ID
-        if game_id not in self.agents:
-            agent = self.agent_factory()
-            agent._ws = self._ws
+        agent = self.agents.get(game_id)
+        if agent is None:
+            agent = self._new_agent()
             self.agents[game_id] = agent
             self.log(f"🤖 Created new agent for game ID: {game_id}")
         
-        return self.agents[game_id]
+        return agent
+
+    def _new_agent(self) -> BaseGameAgent:
+        """Hand out the spare agent if there is one, otherwise build a new one"""
+        agent = self._spare_agent
+        if agent is None:
+            agent = self.agent_factory()
+        else:
+            self._spare_agent = None
+        agent._ws = self._ws
+        return agent
 
     async def run(self):
         """Run the agent runner with multi-game support"""
-        config = self.agent_factory().config  # Get config from factory
+        config = self.config
+        if config is None:
+            # Read the config from a real agent and keep that agent for the first game
+            self._spare_agent = self.agent_factory()
+            config = self.config = self._spare_agent.config
         attempt = 0
         
         while attempt < config.max_reconnect_attempts:
             try:
                 self.log(f"🔌 Connecting to {config.ws_url} (attempt {attempt + 1}/{config.max_reconnect_attempts})")
                 
-                async with websockets.connect(
-                    config.ws_url,
-                    open_timeout=config.connect_timeout
-                ) as ws:
+                async with _connect(config) as ws:
                     self._ws = ws
                     self.log("✅ Connection established")
                     
@@ -570,57 +757,119 @@ class AgentRunner:
         self.print_all_stats()
 
     async def run_loop(self, config: GameConfig):
-        """Main game loop - routes messages to appropriate agents"""
+        """
+        Main game loop - routes messages to appropriate agents.
+
+        Each agent gets its own queue and worker task, so a slow move in one game
+        (e.g. an AI call) doesn't hold up messages for the others. Messages for
+        the same agent are still handled strictly in order.
+        """
         self.log(f"👂 Listening for messages (timeout={config.recv_timeout}s)")
+        if not self._ws:
+            return
+
+        # Bind per-iteration lookups once; none of them change while the socket is open
+        # decode=False hands text frames over as bytes; the JSON parser reads them without a str copy
+        recv = functools.partial(self._ws.recv, decode=False)
+        send = self._ws.send
+        recv_timeout = config.recv_timeout
+        keep_alive = config.keep_alive
+        get_or_create_agent = self.get_or_create_agent
+
+        # game_id -> messages waiting for that game; the shared primary agent gets a single
+        # lane (key None) so its one game state is never driven by two games at once
+        queues: Dict[Optional[str], asyncio.Queue] = {}
+        workers: Set[asyncio.Task] = set()
+        send_lock = asyncio.Lock()  # Keep outgoing frames whole and in order
+        pending = 0  # Messages queued or being handled
+
+        async def agent_worker(lane: Optional[str], agent: BaseGameAgent, queue: asyncio.Queue):
+            """Handle one lane's messages in arrival order and send its replies"""
+            nonlocal pending
+            while True:
+                parsed = await queue.get()
+                try:
+                    response = await agent.handle_message(parsed)
+                    if response:
+                        # UTF-8 bytes sent as a TEXT frame, so websockets skips its own encode
+                        async with send_lock:
+                            await send(json_encode(response), text=True)
+                except websockets.exceptions.ConnectionClosed:
+                    pass  # The reply can't be delivered; the receive loop reports the close
+                except Exception as e:
+                    self.log(f"⚠️ Error handling message for game {parsed.game_id}: {e}", "🚨")
+                    traceback.print_exc()
+                finally:
+                    pending -= 1
+                    queue.task_done()
+
+                # The game is over; retire the lane unless more messages already queued up
+                # behind the result. No await between the check and the delete, so the
+                # receive loop cannot slip a message into a queue that is going away.
+                if parsed.type == MessageType.GAME_RESULT and queue.empty():
+                    del queues[lane]
+                    return
         
-        while self._ws:
-            try:
-                msg = await asyncio.wait_for(
-                    self._ws.recv(),
-                    timeout=config.recv_timeout
-                )
-                
-                # Parse message to determine game_id
+        try:
+            while True:
                 try:
-                    obj = json.loads(msg)
+                    async with asyncio.timeout(recv_timeout):
+                        msg = await recv()
+                    
+                    # Parse message to determine game_id; empty keep-alive frames skip the parser
+                    try:
+                        obj = json_loads(msg) if msg else None
+                    except json.JSONDecodeError:
+                        obj = None
+                    if not isinstance(obj, dict):
+                        self.log("⚠️ Received non-JSON message; ignoring")
+                        continue
                     game_id = obj.get("gameId")
-                except json.JSONDecodeError:
-                    self.log("⚠️ Received non-JSON message; ignoring")
-                    continue
-                
-                # Get or create agent for this game
-                agent = self.get_or_create_agent(game_id)
-                
-                # Parse and handle message
-                parsed = agent.parse_message(msg)
-                if parsed is None:
-                    self.log("⚠️ Failed to parse message; ignoring")
-                    continue
-
-                response = await agent.handle_message(parsed)
-                
-                if response:
-                    await self._ws.send(json.dumps(response))
+                    
+                    # Get or create agent for this game
+                    agent = get_or_create_agent(game_id)
+                    
+                    # Build the ParsedMessage from the dict decoded above (no second JSON parse)
+                    parsed = agent.parse_message_dict(obj, raw=msg)
+
+                    # Hand it to the game's worker, starting one on first use
+                    lane = None if agent is self.primary_agent else game_id
+                    queue = queues.get(lane)
+                    if queue is None:
+                        queue = queues[lane] = asyncio.Queue()
+                        worker = asyncio.create_task(agent_worker(lane, agent, queue))
+                        workers.add(worker)
+                        worker.add_done_callback(workers.discard)
+                    pending += 1
+                    queue.put_nowait(parsed)
+
+                except asyncio.TimeoutError:
+                    # A move still being worked on counts as activity
+                    if keep_alive or pending:
+                        continue
+                    self.log(f"⏹️ No messages within {recv_timeout}s; closing")
+                    break
+                    
+                except websockets.exceptions.ConnectionClosedOK:
+                    self.log("🔒 Connection closed by server (OK)")
+                    break
+                    
+                except websockets.exceptions.ConnectionClosedError as e:
+                    self.log(f"❌ Connection closed with error: {e}")
+                    break
+                    
+                except Exception as e:
+                    self.log(f"⚠️ Unexpected error in game loop: {e}", "🚨")
+                    traceback.print_exc()
+                    break
 
-            except asyncio.TimeoutError:
-                if config.keep_alive:
-                    continue
-                self.log(f"⏹️ No messages within {config.recv_timeout}s; closing")
-                break
-                
-            except websockets.exceptions.ConnectionClosedOK:
-                self.log("🔒 Connection closed by server (OK)")
-                break
-                
-            except websockets.exceptions.ConnectionClosedError as e:
-                self.log(f"❌ Connection closed with error: {e}")
-                break
-                
-            except Exception as e:
-                self.log(f"⚠️ Unexpected error in game loop: {e}", "🚨")
-                import traceback
-                traceback.print_exc()
-                break
+            # Finish messages that already arrived (e.g. a final game result)
+            await asyncio.gather(*(queue.join() for queue in queues.values()))
+        finally:
+            remaining = list(workers)
+            for worker in remaining:
+                worker.cancel()
+            await asyncio.gather(*remaining, return_exceptions=True)
 
     def print_all_stats(self):
         """Print statistics for all agents"""
@@ -635,16 +884,18 @@ class AgentRunner:
                 agent.print_stats()
 
     @staticmethod
-    def run_agent(agent_factory: callable, reusable: bool = False):
+    def run_agent(agent_factory: callable, reusable: bool = False, config: Optional[GameConfig] = None):
         """Convenience method to run an agent with asyncio"""
-        runner = AgentRunner(agent_factory, reusable=reusable)
+        runner = AgentRunner(agent_factory, reusable=reusable, config=config)
         try:
-            asyncio.run(runner.run())
+            asyncio.run(
+                runner.run(),
+                loop_factory=uvloop.new_event_loop if uvloop is not None else None,
+            )
         except KeyboardInterrupt:
             runner.log("⚠️ Interrupted by user", "⏹️")
         except Exception as e:
             runner.log(f"❌ Runner error: {e}", "🔴")
-            import traceback
             traceback.print_exc()
 
 
@@ -5,20 +5,31 @@ This demonstrates how to create a Wordle agent by inheriting from BaseGameAgent.
 Includes OpenAI integration for intelligent guessing.
 """
 
+import argparse
+import asyncio
+import hashlib
 import os
-from typing import Optional, Dict, Any
-from dotenv import load_dotenv
-from openai import AsyncOpenAI
+import re
+import sqlite3
+import time
+from collections import Counter, OrderedDict
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable, Iterable, List
 from pydantic import BaseModel
 
 from game_agent_framework import (
     BaseGameAgent,
     GameConfig,
     GameType,
+    LogLevel,
     ParsedMessage,
     AgentRunner,
 )
 
+if TYPE_CHECKING:
+    # openai is imported on first use so agents with use_ai=False start without it
+    from openai import AsyncOpenAI
+
 
 # ==================== OpenAI Integration ====================
 
@@ -27,40 +38,80 @@ class GuessWord(BaseModel):
     guess: str
     reasoning: Optional[str] = None
 
-from collections import Counter
-from collections import Counter
 
-def generate_word_no_repeats(words, banned=None):
-    if banned is None:
-        banned = set()
-
-    word_length = len(words[0])
-    result = ""
-    used = set()  # keep track of used letters
-
-    for pos in range(word_length):
-        # letters that appear in this position
-        letters = [word[pos] for word in words]
-        freq = Counter(letters).most_common()
-
-        # pick the most frequent allowed letter
-        chosen = None
-        for letter, _ in freq:
-            if letter not in used and letter not in banned:
-                chosen = letter
-                break
+class WordCandidates(BaseModel):
+    """Structured output format for AI candidate word lists"""
+    words: List[str]
 
-        # fallback: pick any unused, allowed letter
-        if not chosen:
-            for c in "abcdefghijklmnopqrstuvwxyz":
-                if c not in used and c not in banned:
-                    chosen = c
-                    break
 
-        result += chosen
-        used.add(chosen)
+# Bit i stands for the i-th letter of the alphabet
+_LETTER_BIT = {c: 1 << i for i, c in enumerate("abcdefghijklmnopqrstuvwxyz")}
+_ALL_LETTERS_MASK = (1 << 26) - 1
+
+def generate_word_no_repeats(words, banned=None):
+    banned_mask = 0
+    for letter in banned or ():
+        banned_mask |= _LETTER_BIT.get(letter, 0)
+
+    result = []
+    used_mask = 0  # keep track of used letters
+
+    # zip(*words) yields each position's letters as one column tuple
+    for column in zip(*words):
+        available = _ALL_LETTERS_MASK & ~(used_mask | banned_mask)
+        if not available:
+            # every letter is used or banned: allow a repeat rather than fail
+            available = (_ALL_LETTERS_MASK & ~banned_mask) or _ALL_LETTERS_MASK
+
+        counts = Counter(column)
+
+        # pick the most frequent allowed letter (only a-z can be guessed) in one
+        # linear scan; max() keeps the first seen on ties, like most_common()
+        chosen = max(
+            (letter for letter in counts if available & _LETTER_BIT.get(letter, 0)),
+            key=counts.__getitem__,
+            default=None,
+        )
 
-    return result
+        # fallback: lowest available letter, read straight from the mask
+        if not chosen:
+            lowest = available & -available
+            chosen = chr(ord("a") + lowest.bit_length() - 1)
+
+        result.append(chosen)
+        used_mask |= _LETTER_BIT[chosen]
+
+    return "".join(result)
+
+def at_most_two_vowels(word: str) -> bool:
+    """Candidate filter: keep words with at most two vowels (y counted as a vowel)"""
+    return sum(c in "aeiouy" for c in word) <= 2
+
+_ALPHABET_SET = frozenset("abcdefghijklmnopqrstuvwxyz")
+
+# Output format block that closes every word prompt
+_PROMPT_FOOTER = "\n".join([
+    "=" * 50,
+    "OUTPUT FORMAT:",
+    "  - List ONLY the words, one per line",
+    "  - Use lowercase letters only",
+    "  - Do NOT include numbers, explanations, or punctuation",
+    "  - Do NOT include any other text",
+    "  - Do NOT include numbered lists like 1. 2. 3. ",
+    "",
+    "EXAMPLE OUTPUT:",
+    "apple",
+    "brave",
+    "candy",
+    "=" * 50,
+    "",
+    "YOUR WORDS:",
+])
+
+@lru_cache(maxsize=256)
+def _quoted_letters(letters: frozenset) -> str:
+    """Format a letter set as "'a', 'b', ..." in alphabetical order"""
+    return ", ".join(f"'{l}'" for l in sorted(letters))
 
 def build_word_prompt(
         letters_exist=None,
@@ -120,48 +171,391 @@ def build_word_prompt(
     # Letters that must NOT appear
     if letters_not_exist:
         parts.append(f"CONSTRAINT {constraint_num}: Forbidden Letters")
-        not_exist_str = ", ".join(f"'{l}'" for l in sorted(letters_not_exist))
+        not_exist_str = _quoted_letters(frozenset(letters_not_exist))
         parts.append(f"  - The word MUST NOT contain any of: {not_exist_str}")
         parts.append("")
         constraint_num += 1
 
     # Optional letters
-    letters_may_exist = set("abcdefghijklmnopqrstuvwxyz") - set(letters_not_exist) - set(letters_exist) - set(exact_positions.values())
+    letters_may_exist = _ALPHABET_SET.difference(letters_not_exist, letters_exist, exact_positions.values())
     if letters_may_exist:
-        may_exist_str = ", ".join(f"'{l}'" for l in sorted(letters_may_exist))
+        may_exist_str = _quoted_letters(letters_may_exist)
         parts.append(f"CONSTRAINT {constraint_num}: Optional Letters")
         parts.append(f"  - The word MAY use any of: {may_exist_str}")
         parts.append("")
         constraint_num += 1
 
-    # Previous guesses
-    if previous_guesses:
+    # Previous guesses (each listed once; a fallback guess can repeat across turns)
+    unique_guesses = [guess for guess in dict.fromkeys(previous_guesses) if guess]
+    if unique_guesses:
         parts.append(f"CONSTRAINT {constraint_num}: No Repeated Guesses")
         parts.append(f"  - DO NOT suggest any of these previously guessed words:")
-        for guess in previous_guesses:
+        for guess in unique_guesses:
             parts.append(f"    × {guess}")
         parts.append("")
 
-    # Output format instructions
-    parts.append("=" * 50)
-    parts.append("OUTPUT FORMAT:")
-    parts.append("  - List ONLY the words, one per line")
-    parts.append("  - Use lowercase letters only")
-    parts.append("  - Do NOT include numbers, explanations, or punctuation")
-    parts.append("  - Do NOT include any other text")
-    parts.append("  - Do NOT include numbered lists like 1. 2. 3. ")
-    parts.append("")
-    parts.append("EXAMPLE OUTPUT:")
-    parts.append("apple")
-    parts.append("brave")
-    parts.append("candy")
-    parts.append("=" * 50)
-    parts.append("")
-    parts.append("YOUR WORDS:")
+    # Output format instructions (fixed text)
+    parts.append(_PROMPT_FOOTER)
 
     return "\n".join(parts)
 
 
+# ==================== Local Word List ====================
+
+def load_word_list(path: str) -> List[str]:
+    """Read a word list file (one word per line), keeping lowercase alphabetic words in file order"""
+    with open(os.path.expanduser(path), encoding="utf-8") as f:
+        words = (line.strip().lower() for line in f)
+        return [word for word in words if word.isalpha()]
+
+
+def index_word_list(words: Iterable[str]) -> Dict[int, str]:
+    """Group words by length into newline-joined blocks, ready for a MULTILINE regex scan"""
+    by_length: Dict[int, List[str]] = {}
+    for word in words:
+        by_length.setdefault(len(word), []).append(word)
+    return {length: "\n".join(group) for length, group in by_length.items()}
+
+
+def constraint_pattern(
+        word_length: int,
+        exact_positions: Dict[int, str],
+        letters_not_exist: Iterable[str],
+        wrong_positions: Dict[int, Iterable[str]],
+) -> "re.Pattern[str]":
+    """
+    Compile one regex line pattern for the positional constraints.
+
+    Each position is either its known letter or a class of the letters not yet
+    ruled out there. Positions are 1-based, like exact_positions.
+    """
+    ruled_out = _ALPHABET_SET.intersection(letters_not_exist)
+    classes = []
+    for idx in range(1, word_length + 1):
+        if idx in exact_positions:
+            classes.append(re.escape(exact_positions[idx]))
+        else:
+            allowed = _ALPHABET_SET.difference(ruled_out, wrong_positions.get(idx, ()))
+            # An empty class is a regex error; "(?!)" matches nothing instead
+            classes.append(f"[{''.join(sorted(allowed))}]" if allowed else "(?!)")
+    return re.compile(f"^{''.join(classes)}$", re.MULTILINE)
+
+
+# ==================== Shared OpenAI Client ====================
+
+# One client (and HTTP connection pool) for every agent on the running event loop
+_shared_client: Optional["AsyncOpenAI"] = None
+_shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Upper bound on open connections in the shared client's pool
+OPENAI_MAX_CONNECTIONS = 50
+
+# Keep idle connections long enough to survive the gap between moves and games
+HTTP_KEEPALIVE_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY = 60.0
+
+# Retries for rate limits (429), timeouts, connection and 5xx errors; the SDK backs
+# off exponentially with jitter and honours Retry-After
+OPENAI_MAX_RETRIES = 4
+
+
+@cache
+def openai_api_key() -> Optional[str]:
+    """Load .env and read OPENAI_API_KEY once per process"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return os.getenv("OPENAI_API_KEY")
+
+
+def get_shared_client() -> Optional["AsyncOpenAI"]:
+    """Return the AsyncOpenAI client for the running event loop, creating it on first use"""
+    global _shared_client, _shared_client_loop
+    # Pooled connections are tied to the loop that opened them, so a new loop
+    # (e.g. a second asyncio.run) gets a fresh client instead of dead sockets
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client_loop is not loop:
+        api_key = openai_api_key()
+        if not api_key:
+            return None
+        import httpx
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        # Created synchronously, so concurrent agents on one event loop cannot race here
+        _shared_client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=OPENAI_MAX_RETRIES,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+            ),
+        )
+        _shared_client_loop = loop
+
+    return _shared_client
+
+
+# ==================== Request Coalescing ====================
+
+# Completion requests currently in flight, keyed by everything that shapes the response
+_inflight_completions: Dict[tuple, asyncio.Task] = {}
+
+# Finished completions under the same key, least recently used first
+_completion_cache: "OrderedDict[tuple, str]" = OrderedDict()
+COMPLETION_CACHE_SIZE = 1024
+
+# Cap on API requests in flight at once across all agents, to stay under rate limits
+MAX_CONCURRENT_COMPLETIONS = 8
+# Created per event loop (see completion_slots); a semaphore is bound to the loop it first waits on
+_completion_slots: Optional[asyncio.Semaphore] = None
+_completion_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Optional requests-per-minute limit; request starts are spaced evenly to stay under it
+REQUESTS_PER_MINUTE: Optional[int] = None
+_next_request_at = 0.0
+
+# Optional on-disk copy of the cache so completions survive restarts (see enable_persistent_cache)
+_persistent_cache: Optional[sqlite3.Connection] = None
+_persistent_ttl: float = 0.0
+
+
+def enable_persistent_cache(path: str = "~/.wordle_completion_cache.db", ttl: float = 7 * 24 * 3600):
+    """
+    Keep finished completions in a SQLite file as well as in memory.
+
+    Args:
+        path: Database file, created if missing
+        ttl: Seconds a stored completion stays valid; older rows are purged on open
+    """
+    global _persistent_cache, _persistent_ttl
+    conn = sqlite3.connect(os.path.expanduser(path), isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS completions (key BLOB PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+    )
+    conn.execute("DELETE FROM completions WHERE created < ?", (time.time() - ttl,))
+    _persistent_cache = conn
+    _persistent_ttl = ttl
+
+
+def _persistent_key(key: tuple) -> bytes:
+    """Fixed-size digest of a completion key, used as the SQLite primary key"""
+    return hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+
+
+def _persistent_get(key: tuple) -> Optional[str]:
+    """Look up a completion in the on-disk cache, ignoring expired rows"""
+    if _persistent_cache is None:
+        return None
+    row = _persistent_cache.execute(
+        "SELECT value FROM completions WHERE key = ? AND created >= ?",
+        (_persistent_key(key), time.time() - _persistent_ttl),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _persistent_put(key: tuple, value: str):
+    """Store a completion in the on-disk cache"""
+    if _persistent_cache is None:
+        return
+    _persistent_cache.execute(
+        "INSERT OR REPLACE INTO completions (key, value, created) VALUES (?, ?, ?)",
+        (_persistent_key(key), value, time.time()),
+    )
+
+
+# Reasoning models spend completion tokens on hidden reasoning as well as the answer
+_REASONING_MODEL_PREFIXES = ("gpt-5", "o1", "o3", "o4")
+REASONING_TOKEN_BUDGET = 150
+
+
+def completion_token_budget(model: str, count: int, word_length: int) -> int:
+    """Completion tokens needed for `count` words: one line (or JSON item) per word plus framing"""
+    if model.startswith(_REASONING_MODEL_PREFIXES):
+        return REASONING_TOKEN_BUDGET
+    return 8 + count * (word_length + 1)
+
+
+# Anything in an AI reply that cannot be part of a guess; newlines separate the words
+_NON_LETTERS = re.compile(r"[^a-z\n]+")
+
+# System message shared by every request; never mutated
+_SYSTEM_MESSAGE = {"role": "system", "content": "You are an expert Wordle player."}
+
+
+def completion_slots() -> asyncio.Semaphore:
+    """Return the request semaphore for the running event loop, creating it on first use"""
+    global _completion_slots, _completion_slots_loop
+    loop = asyncio.get_running_loop()
+    if _completion_slots is None or _completion_slots_loop is not loop:
+        _completion_slots = asyncio.Semaphore(MAX_CONCURRENT_COMPLETIONS)
+        _completion_slots_loop = loop
+    return _completion_slots
+
+
+async def _pace_request():
+    """Wait for this request's start slot under REQUESTS_PER_MINUTE (no-op when unset)"""
+    global _next_request_at
+    if not REQUESTS_PER_MINUTE:
+        return
+    now = time.monotonic()
+    # Reserve the slot before sleeping so concurrent callers queue up behind each other
+    start = max(now, _next_request_at)
+    _next_request_at = start + 60.0 / REQUESTS_PER_MINUTE
+    if start > now:
+        await asyncio.sleep(start - now)
+
+
+async def _request_completion(
+        client: "AsyncOpenAI",
+        model: str,
+        prompt: str,
+        max_tokens: int,
+        structured: bool = False,
+        line_count: Optional[int] = None,
+) -> Optional[str]:
+    """
+    Send a single chat completion request and return the message text.
+
+    With structured=True the model is constrained to the WordCandidates schema
+    and the parsed words are returned one per line, like a plain-text reply.
+    Requests with a line_count are streamed, in either format, and cut off
+    once that many words have arrived.
+    """
+    messages = [_SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
+    async with completion_slots():
+        await _pace_request()
+        if line_count:
+            stream_reply = _stream_words if structured else _stream_lines
+            return await stream_reply(client, model, messages, max_tokens, line_count)
+        response = await client.chat.completions.parse(
+            model=model,
+            messages=messages,
+            max_completion_tokens=max_tokens,
+            **({"response_format": WordCandidates} if structured else {}),
+        )
+    message = response.choices[0].message
+    if not structured:
+        return message.content
+    return "\n".join(message.parsed.words) if message.parsed else None
+
+
+async def _stream_lines(
+        client: "AsyncOpenAI", model: str, messages: List[dict], max_tokens: int, line_count: int
+) -> Optional[str]:
+    """Stream a plain-text completion, closing it once `line_count` non-empty lines are complete"""
+    stream = await client.chat.completions.create(
+        model=model, messages=messages, max_completion_tokens=max_tokens, stream=True
+    )
+    text = ""
+    try:
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            text += delta
+            if "\n" in delta:
+                # Keep complete lines only; the one still being written is dropped
+                complete = text[:text.rfind("\n")]
+                if sum(1 for line in complete.split("\n") if line.strip()) >= line_count:
+                    return complete
+    finally:
+        # Closing early stops the server generating the rest of the reply
+        await stream.close()
+
+    return text or None
+
+
+# A complete JSON string; one still being written has no closing quote yet
+_JSON_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+
+async def _stream_words(
+        client: "AsyncOpenAI", model: str, messages: List[dict], max_tokens: int, line_count: int
+) -> Optional[str]:
+    """Stream a WordCandidates reply, closing it once `line_count` words of its array are complete"""
+    words: List[str] = []
+    # Leaving the context manager closes the response, so the server stops generating
+    async with client.chat.completions.stream(
+        model=model, messages=messages, max_completion_tokens=max_tokens, response_format=WordCandidates
+    ) as stream:
+        async for event in stream:
+            if event.type != "content.delta" or '"' not in event.delta:
+                continue
+            start = event.snapshot.find("[")
+            if start < 0:
+                continue
+            words = _JSON_STRING.findall(event.snapshot, start)
+            if len(words) >= line_count:
+                break
+
+    return "\n".join(words) or None
+
+
+async def coalesced_completion(
+        client: "AsyncOpenAI",
+        model: str,
+        prompt: str,
+        max_tokens: int,
+        structured: bool = False,
+        line_count: Optional[int] = None,
+) -> Optional[str]:
+    """
+    Request a completion, sharing the HTTP call with an identical request already in flight.
+
+    Concurrent games (e.g. parallel evaluation) often reach the same constraint
+    state and therefore build the same prompt; only the first one hits the API.
+    Games that reach it later reuse the cached response.
+    """
+    key = (model, prompt, max_tokens, structured, line_count)
+    cached = _completion_cache.get(key)
+    if cached is not None:
+        _completion_cache.move_to_end(key)
+        return cached
+
+    cached = _persistent_get(key)
+    if cached is not None:
+        _remember_completion(key, cached)
+        return cached
+
+    task = _inflight_completions.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_request_completion(client, model, prompt, max_tokens, structured, line_count))
+        _inflight_completions[key] = task
+        task.add_done_callback(lambda done: _finish_completion(key, done))
+
+    # Shield so one caller being cancelled doesn't cancel the request for the others
+    return await asyncio.shield(task)
+
+
+def _finish_completion(key: tuple, task: asyncio.Task):
+    """Drop a finished request from the in-flight table and cache its response"""
+    _inflight_completions.pop(key, None)
+    if task.cancelled() or task.exception() is not None or task.result() is None:
+        return
+
+    _remember_completion(key, task.result())
+    _persistent_put(key, task.result())
+
+
+def _remember_completion(key: tuple, value: str):
+    """Add a completion to the in-memory LRU cache"""
+    _completion_cache[key] = value
+    if len(_completion_cache) > COMPLETION_CACHE_SIZE:
+        _completion_cache.popitem(last=False)
+
+
+# Common starting words by word length, used by the fallback strategy
+_STARTERS: Dict[int, tuple] = {
+    5: ("arose", "slate", "crane", "adieu", "audio"),
+    6: ("raised", "seared", "silent"),
+    7: ("started", "claimed"),
+}
+
+
 class WordleAgent(BaseGameAgent):
     """
     Wordle-specific agent with OpenAI integration.
@@ -179,25 +573,37 @@ class WordleAgent(BaseGameAgent):
         ai_model: str = "gpt-5-nano",
         use_structured_output: bool = True,
         use_ai: bool = True,
+        candidate_filter: Optional[Callable[[str], bool]] = None,
+        ai_timeout: Optional[float] = None,
+        ensemble: bool = False,
+        word_list: Optional[Iterable[str]] = None,
+        candidate_model: Optional[str] = None,
     ):
         super().__init__(config, GameType.WORDLE)
         self.ai_model = ai_model
+        self.candidate_model = candidate_model  # Cheaper model for candidate lists; ai_model picks single guesses
         self.use_structured_output = use_structured_output
         self.use_ai = use_ai
-        self._ai_client: Optional[AsyncOpenAI] = None
+        self.candidate_filter = candidate_filter  # Prunes AI candidate words, e.g. at_most_two_vowels
+        self.ai_timeout = ai_timeout  # Seconds to wait for the AI before using the fallback guess
+        self.ensemble = ensemble  # Also ask for a single best word alongside the 20 candidates
+        # Known words in order of preference, searched locally before asking the AI
+        self._word_text = index_word_list(word_list) if word_list else {}
         self.alphabet = "abcdefghijklmnopqrstuvwxyz"
-        self.letters_exist: list[str] = []
+        self.letters_exist: list[str] = []  # in discovery order, which the prompt preserves
+        self._letters_exist_set: set[str] = set()  # same letters, for membership tests
         self.letters_not_exist: set[str] = set()
         self.exact_positions: Dict[int, str] = {}
+        self._exact_letters: set[str] = set()  # letters of exact_positions, for membership tests
+        self.wrong_positions: Dict[int, set[str]] = {}  # position -> letters known not to be there
 
         
         # Track game state for AI context
         self.guess_history: list[str] = []
         self.feedback_history: list[list[str]] = []
         
-        # Load OpenAI API key
-        load_dotenv()
-        if use_ai and not os.getenv("OPENAI_API_KEY"):
+        # Load OpenAI API key (read once per process, only when AI is on)
+        if use_ai and not openai_api_key():
             self.log("⚠️ OPENAI_API_KEY not found; AI features disabled", "🚨")
             self.use_ai = False
 
@@ -211,41 +617,42 @@ class WordleAgent(BaseGameAgent):
         
         last_guess = parsed.last_guess.lower()
         last_result = parsed.last_result
-        print("Last guess:", last_guess)
-        print("Last result:", last_result)
+        if self._should_log(LogLevel.DEBUG):
+            self.log(f"Last guess: {last_guess}, result: {last_result}", "📥", LogLevel.DEBUG)
         
         for idx, (letter, result) in enumerate(zip(last_guess, last_result), start=1):
             if result == "correct":
                 self.exact_positions[idx] = letter
-                if letter not in self.letters_exist:
-                    self.letters_exist.append(letter)
+                self._exact_letters.add(letter)
+                self._add_existing_letter(letter)
             elif result == "present":
-                if letter not in self.letters_exist:
-                    self.letters_exist.append(letter)
+                self._add_existing_letter(letter)
+                self.wrong_positions.setdefault(idx, set()).add(letter)
             elif result == "absent":
                 # Only add to not_exist if not already confirmed elsewhere
-                if letter not in self.letters_exist and letter not in self.exact_positions.values():
+                if letter not in self._letters_exist_set and letter not in self._exact_letters:
                     self.letters_not_exist.add(letter)
 
-    def _get_ai_client(self) -> Optional[AsyncOpenAI]:
-        """Lazy-load OpenAI client"""
+    def _add_existing_letter(self, letter: str):
+        """Record a letter known to be in the word, once"""
+        if letter not in self._letters_exist_set:
+            self._letters_exist_set.add(letter)
+            self.letters_exist.append(letter)
+
+    def _get_ai_client(self) -> Optional["AsyncOpenAI"]:
+        """OpenAI client shared by all agents on this event loop, see get_shared_client"""
         if not self.use_ai:
             return None
-        
-        if self._ai_client is None:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                return None
-            self._ai_client = AsyncOpenAI(api_key=api_key)
-        
-        return self._ai_client
 
-    async def _generate_words(self, count: int, word_length: int) -> Optional[str]:
-        """Get AI guess using simple text response"""
+        return get_shared_client()
+
+    async def _generate_words(self, count: int, word_length: int) -> Optional[List[str]]:
+        """Get candidate words from the AI (structured or plain-text response)"""
         client = self._get_ai_client()
         if client is None:
             return None
 
+        model = self.ai_model if count == 1 else (self.candidate_model or self.ai_model)
         try:
             prompt =  build_word_prompt(
                 letters_exist=self.letters_exist,
@@ -255,53 +662,83 @@ class WordleAgent(BaseGameAgent):
                 count=count,
                 previous_guesses=self.guess_history,
             )
-            print("-----")
-            print(prompt)
-            print("-----")
-            response = await client.chat.completions.parse(
-                model=self.ai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert Wordle player."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ],
-                max_completion_tokens=150,
+            if self._should_log(LogLevel.DEBUG):
+                self.log(f"Prompt:\n{prompt}", "📝", LogLevel.DEBUG)
+            content = await asyncio.wait_for(
+                coalesced_completion(
+                    client,
+                    model,
+                    prompt,
+                    max_tokens=completion_token_budget(model, count, word_length),
+                    structured=self.use_structured_output,
+                    line_count=count,
+                ),
+                timeout=self.ai_timeout,
             )
-            words_str = response.choices[0].message.content.strip().lower()
-            print(f"AI Response:\n{words_str}")
-            # Extract just the word if AI added extra text
-            words = words_str.split("\n")
-            words = [word.strip() for word in words if word.strip()]
-            # remove non alphabetic letters from each word, as 1. are added
-            words = [''.join(filter(str.isalpha, word)) for word in words if len(word) == word_length]
+            if not content:
+                self.log("⚠️ AI returned no words", "🚨")
+                return None
+            words_str = content.strip().lower()
+            if self._should_log(LogLevel.DEBUG):
+                self.log(f"AI response:\n{words_str}", "🤖", LogLevel.DEBUG)
+            # Drop everything but letters and newlines (e.g. "1. " numbering) in one scan, then check the length
+            words = [word for word in _NON_LETTERS.sub("", words_str).split("\n") if len(word) == word_length]
 
             self.log(f"🤖 AI generated words: {words}", "💡")
             
             return words
             
+        except asyncio.TimeoutError:
+            # The shared request keeps running and caches its response for later games
+            self.log(f"⏱️ AI took longer than {self.ai_timeout}s", "🚨")
+            return None
+
         except Exception as exc:
             self.log(f"⚠️ AI guess failed: {exc}", "🚨")
             return None
 
+    def _matches_constraints(self, word: str) -> bool:
+        """Check a word against everything learned from feedback so far"""
+        if not word.isalpha() or word in self.guess_history:
+            return False
+        if any(letter in self.letters_not_exist for letter in word):
+            return False
+        if any(letter not in word for letter in self.letters_exist):
+            return False
+        if any(word[idx - 1] in letters for idx, letters in self.wrong_positions.items() if idx <= len(word)):
+            return False
+        return all(
+            idx <= len(word) and word[idx - 1] == letter
+            for idx, letter in self.exact_positions.items()
+        )
+
+    def _local_candidates(self, word_length: int) -> List[str]:
+        """Words from the word list that satisfy every constraint learned so far"""
+        text = self._word_text.get(word_length)
+        if not text:
+            return []
+        pattern = constraint_pattern(
+            word_length, self.exact_positions, self.letters_not_exist, self.wrong_positions
+        )
+        return [
+            word for word in pattern.findall(text)
+            if word not in self.guess_history and all(letter in word for letter in self.letters_exist)
+        ]
+
+    def _filter_candidates(self, words: List[str]) -> List[str]:
+        """Apply the candidate filter, keeping the full list if no word passes"""
+        if self.candidate_filter is None:
+            return words
+        filtered = [word for word in words if self.candidate_filter(word)]
+        return filtered or words
+
     def _fallback_guess(self, parsed: ParsedMessage) -> str:
         """Simple fallback strategy when AI is unavailable"""
         length = parsed.word_length or 5
         
-        # Common starting words
-        starters = {
-            5: ["arose", "slate", "crane", "adieu", "audio"],
-            6: ["raised", "seared", "silent"],
-            7: ["started", "claimed"],
-        }
-        
         attempt = parsed.current_attempt or 1
-        if attempt == 1 and length in starters:
-            return starters[length][0]
+        if attempt == 1 and length in _STARTERS:
+            return _STARTERS[length][0]
         
         # Use alphabet as last resort
         return self.alphabet[:length]
@@ -317,21 +754,45 @@ class WordleAgent(BaseGameAgent):
             word = "aioue"
             return word
         self._update_feedback(parsed)
-        print("Letters exist:", self.letters_exist)
-        print("Letters not exist:", self.letters_not_exist)
-        print("Exact positions:", self.exact_positions)
+        if self._should_log(LogLevel.DEBUG):
+            self.log(
+                f"Letters exist: {self.letters_exist}, not exist: {sorted(self.letters_not_exist)}, "
+                f"exact positions: {self.exact_positions}",
+                "🔎",
+                LogLevel.DEBUG,
+            )
+        # Same default length as _fallback_guess when the message omits wordLength
+        length = parsed.word_length or 5
+        narrow = len(self.guess_history) == 3 or len(self.letters_exist) >= length - 1 or len(self.guess_history) >= 5
+        candidates = self._local_candidates(length)
+        if candidates:
+            self.log(f"📚 {len(candidates)} word list candidates", "💡")
+            if narrow:
+                return candidates[0]
+            candidates = self._filter_candidates(candidates)
+            return generate_word_no_repeats(candidates, banned=(self.letters_not_exist | self._letters_exist_set))
         if self.use_ai:
-            if len(self.guess_history) == 3 or len(self.letters_exist) >= parsed.word_length - 1 or len(self.guess_history) >= 5:
-                words = await self._generate_words(1, parsed.word_length)
+            if narrow:
+                words = await self._generate_words(1, length)
                 if not words:
                     self.log("⚠️ AI guess failed; using fallback", "🔄")
                     fallback = self._fallback_guess(parsed)
                     self.log(f"✳️ Using fallback guess: {fallback}", "🔄")
                     return fallback
                 return words[0]
-            words = await self._generate_words(20, parsed.word_length)
+            if self.ensemble:
+                # Both requests run concurrently; a valid single guess wins
+                words, best = await asyncio.gather(
+                    self._generate_words(20, length),
+                    self._generate_words(1, length),
+                )
+                if best and self._matches_constraints(best[0]):
+                    return best[0]
+            else:
+                words = await self._generate_words(20, length)
             if words:
-                guess = generate_word_no_repeats(words, banned=(self.letters_not_exist | set(self.letters_exist)))
+                words = self._filter_candidates(words)
+                guess = generate_word_no_repeats(words, banned=(self.letters_not_exist | self._letters_exist_set))
                 return guess
             self.log("⚠️ AI guess failed; using fallback", "🔄")
         
@@ -353,28 +814,50 @@ class WordleAgent(BaseGameAgent):
         }
 
     def on_game_start(self, parsed: ParsedMessage):
-        """Reset history when new game starts"""
-        self.guess_history = []
-        self.feedback_history = []
+        """Reset per-game state when new game starts"""
+        self._clear_game_state()
         self.log(f"🎮 New Wordle game - Word length: {parsed.word_length}, Max attempts: {parsed.max_attempts}")
 
     def on_game_result(self, parsed: ParsedMessage):
         """Log game completion"""
         if parsed.word:
             self.log(f"📝 The word was: {parsed.word.upper()}")
-        self.letters_exist = []
-        self.letters_not_exist = set()
-        self.exact_positions = {}
-        self.guess_history = []
-        self.feedback_history = []
+        self._clear_game_state()
+
+    def reset(self):
+        """Clear per-game Wordle state; the AI client is kept for the next game"""
+        super().reset()
+        self._clear_game_state()
+
+    def _clear_game_state(self):
+        """Forget constraints and history gathered during the current game"""
+        # Cleared in place so the containers are reused across games
+        self.letters_exist.clear()
+        self._letters_exist_set.clear()
+        self.letters_not_exist.clear()
+        self.exact_positions.clear()
+        self._exact_letters.clear()
+        self.wrong_positions.clear()
+        self.guess_history.clear()
+        self.feedback_history.clear()
 
 
 # ==================== Main Entry Point ====================
 
 if __name__ == "__main__":
+    # Command-line options, so the agent can be launched without editing this file
+    parser = argparse.ArgumentParser(description="Run the Wordle agent")
+    parser.add_argument("--url", default="ws://localhost:2025", help="Game server WebSocket URL")
+    parser.add_argument("--model", default="gpt-4o", help="OpenAI model for single guesses")
+    parser.add_argument("--candidate-model", default="gpt-4o-mini", help="OpenAI model for candidate lists")
+    parser.add_argument("--no-ai", action="store_true", help="Use only the word list and fallback guesses")
+    parser.add_argument("--word-list", help="File of known words (one per line) to search before asking the AI")
+    parser.add_argument("--reusable", action="store_true", help="Let one agent handle every game")
+    args = parser.parse_args()
+
     # Configuration
     config = GameConfig(
-        ws_url="ws://localhost:2025",
+        ws_url=args.url,
         connect_timeout=10,
         recv_timeout=2,
         keep_alive=True,
@@ -382,13 +865,17 @@ if __name__ == "__main__":
         reconnect_delay=5,
     )
     
+    word_list = load_word_list(args.word_list) if args.word_list else None
+
     # Create agent factory for new framework
     def create_wordle_agent():
         return WordleAgent(
             config=config,
-            ai_model="gpt-4o",
+            ai_model=args.model,
+            candidate_model=args.candidate_model,
             use_structured_output=True,
-            use_ai=True,
+            use_ai=not args.no_ai,
+            word_list=word_list,
         )
     
     # Run the agent
@@ -396,8 +883,6 @@ if __name__ == "__main__":
     print("🎮 Wordle Agent Starting...")
     print("=" * 60)
     
-    # Option 1: New agent for each game ID (recommended for Wordle)
-    AgentRunner.run_agent(create_wordle_agent, reusable=False)
-    
-    # Option 2: Single agent handles all games (uncomment to use)
-    # AgentRunner.run_agent(create_wordle_agent, reusable=True)
+    # Default: new agent for each game ID (recommended for Wordle)
+    # --reusable: single agent handles all games
+    AgentRunner.run_agent(create_wordle_agent, reusable=args.reusable)